@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     API_VERSION: str = "1.0.0"
     API_DESCRIPTION: str = "API para sincronizar datos de SQL Server a Monday.com"
 
+    # Config perfilado (opcional, para diagnosticar sincronizaciones lentas)
+    PROFILE_SYNC: bool = False
+    PROFILE_DIR: str = str(Path(__file__).parent.parent / 'profiles')
+
     model_config = SettingsConfigDict(
         env_file=Path(__file__).parent.parent / '.env',
         env_file_encoding='utf-8',
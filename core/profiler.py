@@ -0,0 +1,148 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# cProfile solo admite un perfil activo por proceso; en Python < 3.12 un segundo
+# enable() reemplaza silenciosamente al primero, por eso se serializa aquí.
+_active_lock = threading.Lock()
+
+
+class SyncProfiler:
+    """Perfilador opcional para una ejecución de sincronización.
+
+    Captura un perfil de CPU (cProfile), el tiempo de reloj por fase y una
+    instantánea de memoria (tracemalloc). Si está deshabilitado, todas las
+    operaciones son no-op para no afectar las ejecuciones normales.
+    """
+
+    def __init__(self, name: str, output_dir: str, enabled: bool = False, top_n: int = 25):
+        self.name = name
+        self.output_dir = Path(output_dir)
+        self.enabled = enabled
+        self.top_n = top_n
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.artifact_path: Optional[Path] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_at: Optional[float] = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Inicia la captura de CPU y memoria"""
+        if not self.enabled:
+            return
+        if not _active_lock.acquire(blocking=False):
+            # Otra ejecución (p. ej. una petición simultánea) ya se está perfilando
+            logger.warning(f"No se pudo iniciar el perfil de '{self.name}': ya hay un perfil activo")
+            self.enabled = False
+            return
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self._profile = cProfile.Profile()
+            self._started_at = time.perf_counter()
+            self._profile.enable()
+        except Exception as e:
+            logger.warning(f"No se pudo iniciar el perfil de '{self.name}': {str(e)}")
+            self._release()
+            self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Acumula el tiempo de reloj de una fase (SQL, mapeo, HTTP, etc.)"""
+        if not self.enabled:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stats["seconds"] += time.perf_counter() - inicio
+            stats["calls"] += 1
+
+    def _release(self):
+        """Libera cProfile, tracemalloc y el candado global"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        _active_lock.release()
+
+    def stop(self) -> Optional[Path]:
+        """Detiene la captura y escribe los artefactos; regresa la ruta del resumen JSON.
+
+        Nunca lanza excepciones: un fallo al guardar el perfil solo se registra
+        como advertencia para no alterar el resultado de la ejecución.
+        """
+        if not self.enabled or self._profile is None:
+            return None
+
+        profile = self._profile
+        try:
+            profile.disable()
+            wall_seconds = time.perf_counter() - self._started_at
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        except Exception as e:
+            logger.warning(f"No se pudo capturar el perfil de '{self.name}': {str(e)}")
+            return None
+        finally:
+            self._release()
+
+        try:
+            return self._write_artifacts(profile, wall_seconds, snapshot, current, peak)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el perfil de '{self.name}' en {self.output_dir}: {str(e)}")
+            return None
+
+    def _write_artifacts(self, profile: cProfile.Profile, wall_seconds: float,
+                         snapshot: tracemalloc.Snapshot, current: int, peak: int) -> Path:
+        """Escribe el .prof de cProfile y el resumen JSON en output_dir"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        pstats_path = self.output_dir / f"{base}.prof"
+        summary_path = self.output_dir / f"{base}.json"
+
+        # Perfil completo, legible con `python -m pstats` o snakeviz
+        profile.dump_stats(str(pstats_path))
+
+        buffer = io.StringIO()
+        pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(self.top_n)
+
+        summary: Dict[str, Any] = {
+            "name": self.name,
+            "wall_seconds": round(wall_seconds, 6),
+            "phases": {
+                fase: {"seconds": round(datos["seconds"], 6), "calls": datos["calls"]}
+                for fase, datos in sorted(self.phases.items(), key=lambda x: x[1]["seconds"], reverse=True)
+            },
+            "memory": {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:self.top_n]
+                ],
+            },
+            "cpu_profile_file": pstats_path.name,
+            "cpu_top": buffer.getvalue(),
+        }
+
+        summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.artifact_path = summary_path
+        logger.info(f"Perfil de '{self.name}' guardado en {summary_path}")
+        return summary_path
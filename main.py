@@ -1,9 +1,12 @@
+from pathlib import Path
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from services.sql_service import SQLService
 from services.sync_service import SyncService
 from models.schemas import Compra     
 from core.database import get_db
+from core.profiler import SyncProfiler
 from config.settings import settings
 import logging
 
@@ -15,21 +18,56 @@ app = FastAPI(
 )
 
 @app.post("/sync-recent-purchasescmh", tags=["Sync"])
-async def sync_recent_purchases(db: Session = Depends(get_db)):
+async def sync_recent_purchases(profile: bool = False, db: Session = Depends(get_db)):
     """Endpoint para sincronizar compras recientes con Monday.com y actualizar SQL"""
+    profiler = SyncProfiler(
+        "sync-recent-purchasescmh",
+        output_dir=settings.PROFILE_DIR,
+        enabled=profile or settings.PROFILE_SYNC
+    )
+    profiler.start()
     try:
         # Obtener compras recientes
         sql_service = SQLService(db)
-        purchases = sql_service.get_recent_purchases()
+        with profiler.phase("sql_fetch"):
+            purchases = sql_service.get_recent_purchases()
         
         # Sincronizar con Monday.com y actualizar SQL
         sync_service = SyncService()
-        result = sync_service.sync_purchases(purchases, db)  # Pasamos la sesión de DB
+        result = sync_service.sync_purchases(purchases, db, profiler=profiler)  # Pasamos la sesión de DB
         
-        return {
+        response = {
             "status": "success",
             **result
         }
     except Exception as e:
         db.rollback()  # Asegurar que no quedan transacciones pendientes
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        detail = str(e)
+        # Las ejecuciones fallidas también dejan su perfil para diagnóstico
+        if profiler.stop():
+            detail = f"{detail} (perfil: {profiler.artifact_path.name})"
+        raise HTTPException(status_code=500, detail=detail)
+    finally:
+        profiler.stop()
+
+    if profiler.artifact_path:
+        response["profile"] = profiler.artifact_path.name
+    return response
+
+@app.get("/profiles", tags=["Sync"])
+async def list_profiles():
+    """Lista los resúmenes de perfilado disponibles, del más reciente al más antiguo"""
+    profile_dir = Path(settings.PROFILE_DIR)
+    if not profile_dir.is_dir():
+        return {"profiles": []}
+    resumenes = sorted(profile_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return {"profiles": [p.name for p in resumenes]}
+
+@app.get("/profiles/{artifact}", tags=["Sync"])
+async def get_profile(artifact: str):
+    """Descarga un artefacto de perfilado (.json resumen o .prof de cProfile)"""
+    profile_dir = Path(settings.PROFILE_DIR).resolve()
+    path = (profile_dir / artifact).resolve()
+    if path.parent != profile_dir or path.suffix not in (".json", ".prof") or not path.is_file():
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return FileResponse(path)
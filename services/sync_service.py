@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from models.schemas import Compra, MondayItem
 from models.entities import SQLCOMPC03
 from core.monday_client import monday_client
+from core.profiler import SyncProfiler
 from config.settings import settings
 import logging
 
@@ -32,32 +33,37 @@ class SyncService:
             column_values=column_values
         )
     
-    def sync_purchases(self, purchases: List[Compra], db: Session) -> dict:
+    def sync_purchases(self, purchases: List[Compra], db: Session, profiler: Optional[SyncProfiler] = None) -> dict:
         """Sincroniza las compras con Monday.com y actualiza SQL"""
+        profiler = profiler or SyncProfiler("sync", output_dir=settings.PROFILE_DIR)
         results = []
         for purchase in purchases:
             try:
                 # 1. Obtener o crear el grupo correspondiente al mes de la fecha
-                group_id = monday_client.get_or_create_group_by_date(
-                    board_id=settings.MONDAY_BOARD_ID,
-                    fecha_doc=purchase.FECHA_DOC
-                )
+                with profiler.phase("monday_group"):
+                    group_id = monday_client.get_or_create_group_by_date(
+                        board_id=settings.MONDAY_BOARD_ID,
+                        fecha_doc=purchase.FECHA_DOC
+                    )
 
                 # 2. Mapear datos a formato Monday
-                monday_item = self.map_to_monday_format(purchase)
+                with profiler.phase("mapping"):
+                    monday_item = self.map_to_monday_format(purchase)
 
                 # 3. Crear item en Monday en el grupo correcto
-                result = monday_client.create_item(
-                    board_id=settings.MONDAY_BOARD_ID,
-                    item_name=monday_item.name,
-                    column_values=monday_item.column_values,
-                    group_id=group_id  # ← AQUÍ SE ESPECIFICA EL GRUPO
-                )
+                with profiler.phase("monday_create_item"):
+                    result = monday_client.create_item(
+                        board_id=settings.MONDAY_BOARD_ID,
+                        item_name=monday_item.name,
+                        column_values=monday_item.column_values,
+                        group_id=group_id  # ← AQUÍ SE ESPECIFICA EL GRUPO
+                    )
 
                 # 4. Si se sincronizó correctamente, marcarlo en SQL
                 if result.get('data', {}).get('create_item', {}).get('id'):
-                    db.query(SQLCOMPC03).filter(SQLCOMPC03.CVE_DOC == purchase.CVE_DOC).update({"SINCRONIZADO": True})
-                    db.commit()
+                    with profiler.phase("sql_update"):
+                        db.query(SQLCOMPC03).filter(SQLCOMPC03.CVE_DOC == purchase.CVE_DOC).update({"SINCRONIZADO": True})
+                        db.commit()
 
                     # Calcular nombre del grupo para el log
                     meses = {1: "ENE", 2: "FEB", 3: "MAR", 4: "ABR", 5: "MAY", 6: "JUN",
@@ -2,12 +2,22 @@ from datetime import datetime, timedelta
 import fdb
 import pyodbc
 from settingsfb import load_configurations, ConfigError
+from core.profiler import SyncProfiler
 import os
+import sys
 
-def exportar_registros():
+def exportar_registros(profile: bool = False):
     try:
         # 1. Cargar configuraciones
         configs = load_configurations()
+
+        # Perfilado opcional: argumento, --profile o PROFILE_SYNC=1 (leído después de cargar .env.db)
+        profiler = SyncProfiler(
+            "exportar_registros",
+            output_dir=os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")),
+            enabled=profile or os.getenv("PROFILE_SYNC", "").lower() in ("1", "true", "yes")
+        )
+        profiler.start()
         
         # Obtener días a transferir desde variable de entorno (por defecto: 30)
         dias_atras = int(os.getenv("DIAS_A_TRANSFERIR", 30))
@@ -19,12 +29,13 @@ def exportar_registros():
 
         # 3. Conexión a Firebird
         try:
-            firebird_conn = fdb.connect(**fb_config)
-            firebird_cursor = firebird_conn.cursor()
+            with profiler.phase("firebird_connect"):
+                firebird_conn = fdb.connect(**fb_config)
+                firebird_cursor = firebird_conn.cursor()
 
-            # Verificación básica de conexión
-            firebird_cursor.execute("SELECT COUNT(*) FROM COMPC03")
-            total_registros = firebird_cursor.fetchone()[0]
+                # Verificación básica de conexión
+                firebird_cursor.execute("SELECT COUNT(*) FROM COMPC03")
+                total_registros = firebird_cursor.fetchone()[0]
             
         except fdb.fbcore.DatabaseError as e:
             print(f"❌ Error de conexión a Firebird: {str(e)}")
@@ -35,15 +46,16 @@ def exportar_registros():
 
         # 5. Conexión a SQL Server
         try:
-            sql_conn = pyodbc.connect(
-                sql_config['connection_string'],
-                timeout=sql_config.get('timeout', 30)
-            )
-            sql_cursor = sql_conn.cursor()
-            
-            # Test simple de conexión
-            sql_cursor.execute("SELECT DB_NAME() AS db_name")
-            db_name = sql_cursor.fetchone()[0]
+            with profiler.phase("sqlserver_connect"):
+                sql_conn = pyodbc.connect(
+                    sql_config['connection_string'],
+                    timeout=sql_config.get('timeout', 30)
+                )
+                sql_cursor = sql_conn.cursor()
+                
+                # Test simple de conexión
+                sql_cursor.execute("SELECT DB_NAME() AS db_name")
+                db_name = sql_cursor.fetchone()[0]
             
         except pyodbc.Error as e:
             error_msg = str(e).replace(sql_config['connection_string'], '*****')
@@ -75,25 +87,27 @@ def exportar_registros():
 
         # 7. Obtener registros ya transferidos
         try:
-            sql_cursor.execute("SELECT CVE_DOC FROM SQLCOMPC03")
-            docs_transferidos = {row[0] for row in sql_cursor.fetchall()}
+            with profiler.phase("sql_fetch_existing"):
+                sql_cursor.execute("SELECT CVE_DOC FROM SQLCOMPC03")
+                docs_transferidos = {row[0] for row in sql_cursor.fetchall()}
         except pyodbc.Error as e:
             print(f"❌ Error al consultar registros existentes: {str(e)}")
             return
 
         # 8. Consulta Firebird para registros del rango de fechas
         try:
-            firebird_cursor.execute("""
-            SELECT f.CVE_DOC, c.NOMBRE, f.SU_REFER, CAST(f.FECHA_DOC AS DATE) AS FECHA_DOC, f.FECHA_PAG, m.DESCR AS MONEDA, f.TIPCAMB, f.TOT_IND, f.IMPORTE,
-            (CASE WHEN f.TIPCAMB = 0 THEN 0 ELSE f.IMPORTE / f.TIPCAMB END) AS IMPORTEME, 0 AS SINCRONIZADO
-            FROM COMPC03 f JOIN PROV03 c ON f.CVE_CLPV = c.CLAVE JOIN MONED03 m ON f.NUM_MONED = m.NUM_MONED
-            WHERE CAST(FECHA_DOC AS DATE) BETWEEN ? AND ?
-            """, (fecha_inicio, fecha_actual))
+            with profiler.phase("firebird_fetch"):
+                firebird_cursor.execute("""
+                SELECT f.CVE_DOC, c.NOMBRE, f.SU_REFER, CAST(f.FECHA_DOC AS DATE) AS FECHA_DOC, f.FECHA_PAG, m.DESCR AS MONEDA, f.TIPCAMB, f.TOT_IND, f.IMPORTE,
+                (CASE WHEN f.TIPCAMB = 0 THEN 0 ELSE f.IMPORTE / f.TIPCAMB END) AS IMPORTEME, 0 AS SINCRONIZADO
+                FROM COMPC03 f JOIN PROV03 c ON f.CVE_CLPV = c.CLAVE JOIN MONED03 m ON f.NUM_MONED = m.NUM_MONED
+                WHERE CAST(FECHA_DOC AS DATE) BETWEEN ? AND ?
+                """, (fecha_inicio, fecha_actual))
             
-            registros = [
-                row for row in firebird_cursor.fetchall()
-                if row[0] not in docs_transferidos
-            ]
+                registros = [
+                    row for row in firebird_cursor.fetchall()
+                    if row[0] not in docs_transferidos
+                ]
             
             print(f"Registros nuevos encontrados: {len(registros)}")
             
@@ -105,11 +119,12 @@ def exportar_registros():
         if registros:
             try:
                 print("\nIniciando transferencia...")
-                sql_cursor.executemany(
-                    "INSERT INTO SQLCOMPC03 (CVE_DOC, NOMBRE, SU_REFER, FECHA_DOC, FECHA_PAG, MONEDA, TIPCAMB, TOT_IND, IMPORTE, IMPORTEME, SINCRONIZADO) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", 
-                    registros
-                )
-                sql_conn.commit()
+                with profiler.phase("sql_insert"):
+                    sql_cursor.executemany(
+                        "INSERT INTO SQLCOMPC03 (CVE_DOC, NOMBRE, SU_REFER, FECHA_DOC, FECHA_PAG, MONEDA, TIPCAMB, TOT_IND, IMPORTE, IMPORTEME, SINCRONIZADO) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", 
+                        registros
+                    )
+                    sql_conn.commit()
                 print(f"✔ Registros transferidos exitosamente: {len(registros)}")
                 
             except pyodbc.Error as e:
@@ -132,8 +147,13 @@ def exportar_registros():
             sql_cursor.close()
         if 'sql_conn' in locals(): 
             sql_conn.close()
+        # 11. Guardar perfil si está habilitado (stop() nunca lanza excepciones)
+        if 'profiler' in locals():
+            ruta_perfil = profiler.stop()
+            if ruta_perfil:
+                print(f"\nPerfil guardado en: {ruta_perfil}")
 
 if __name__ == "__main__":
     print("=== Inicio del proceso de transferencia ===")
-    exportar_registros()
+    exportar_registros(profile="--profile" in sys.argv[1:])
     print("\n=== Proceso completado ===")
\ No newline at end of file